@@ -1,33 +1,84 @@
+import sqlite3
 import unittest
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from werkzeug.security import generate_password_hash
+
 from watchlist import app, db
 from watchlist.modules import User, Movie
 from watchlist.commands import forge, initdb
 
+template_db = None
+
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    Trade durability for speed, the test database is never persisted.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=MEMORY')
+    cursor.execute('PRAGMA synchronous=OFF')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA locking_mode=EXCLUSIVE')
+    cursor.close()
+
+
+def setUpModule():
+    """
+    Build the schema and test data once, and snapshot it into a template database.
+    """
+    global template_db
+    # Update configurations
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI='sqlite:///:memory:'
+    )
+    # Create database table
+    db.create_all()
+    # Create test data
+    user = User(name='Test', username='test')
+    # A single PBKDF2 iteration keeps every login in the tests cheap,
+    # the admin command tests still cover set_password
+    user.password_hash = generate_password_hash('123', method='pbkdf2:sha256:1')
+    movie = Movie(title='Test Movie', year='2023')
+    db.session.add_all([user, movie])
+    db.session.commit()
+    db.session.remove()
+
+    template_db = sqlite3.connect(':memory:')
+    connection = db.engine.raw_connection()
+    try:
+        connection.driver_connection.backup(template_db)
+    finally:
+        connection.close()
+
+
+def tearDownModule():
+    template_db.close()
+
 
 class WatchlistTestCase(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.client = app.test_client()  # Create test client
+        cls.runner = app.test_cli_runner()  # Create test command runner
+
     def setUp(self):
-        # Update configurations
-        app.config.update(
-            TESTING=True,
-            SQLALCHEMY_DATABASE_URI='sqlite:///:memory:'
-        )
-        # Create database table
-        db.create_all()
-        # Create test data
-        user = User(name='Test', username='test')
-        user.set_password('123')
-        movie = Movie(title='Test Movie', year='2023')
-        db.session.add_all([user, movie])
-        db.session.commit()
+        # Restore the in-memory database from the template
+        connection = db.engine.raw_connection()
+        try:
+            template_db.backup(connection.driver_connection)
+        finally:
+            connection.close()
 
-        self.client = app.test_client()  # Create test client
-        self.runner = app.test_cli_runner()  # Create test command runner
+        # Start every test logged out
+        self.client.delete_cookie(app.config['SESSION_COOKIE_NAME'])
 
     def tearDown(self):
         db.session.remove()
-        db.drop_all()
 
     def test_app_exist(self):
         """
@@ -46,9 +97,7 @@ class WatchlistTestCase(unittest.TestCase):
         Test the 404 not found page of app.
         """
         response = self.client.get('/nothing')
-        data = response.get_data(as_text=True)
-        self.assertIn('Page Not Found - 404', data)
-        self.assertIn('Go Back', data)
+        self.assert_page(response, present=['Page Not Found - 404', 'Go Back'])
         self.assertEqual(response.status_code, 404)
 
     def test_index_page(self):
@@ -56,9 +105,7 @@ class WatchlistTestCase(unittest.TestCase):
         Test the main page (index page) of app.
         """
         response = self.client.get('/')
-        data = response.get_data(as_text=True)
-        self.assertIn('Test\'s Watchlist', data)
-        self.assertIn('Test Movie', data)
+        self.assert_page(response, present=['Test\'s Watchlist', 'Test Movie'])
         self.assertEqual(response.status_code, 200)
 
     def login(self):
@@ -70,6 +117,16 @@ class WatchlistTestCase(unittest.TestCase):
             password='123'
         ), follow_redirects=True)
 
+    def assert_page(self, response, present=(), absent=()):
+        """
+        Helping method, used to check the page text once against many snippets.
+        """
+        data = response.get_data(as_text=True)
+        for text in present:
+            self.assertIn(text, data)
+        for text in absent:
+            self.assertNotIn(text, data)
+
     def test_create_item(self):
         """
         Test the creation of new item in index page.
@@ -81,27 +138,21 @@ class WatchlistTestCase(unittest.TestCase):
             title='New Movie',
             year='2023'
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Item created.', data)
-        self.assertIn('New Movie', data)
+        self.assert_page(response, present=['Item created.', 'New Movie'])
 
         # Try to create invalid item, with empty title
         response = self.client.post('/', data=dict(
             title='',
             year='2023'
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Invalid input.', data)
-        self.assertNotIn('Item created.', data)
+        self.assert_page(response, present=['Invalid input.'], absent=['Item created.'])
 
         # Try to create invalid item, with empty year
         response = self.client.post('/', data=dict(
             title='New Movie',
             year=''
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Invalid input.', data)
-        self.assertNotIn('Item created.', data)
+        self.assert_page(response, present=['Invalid input.'], absent=['Item created.'])
 
     def test_edit_item(self):
         """
@@ -111,38 +162,32 @@ class WatchlistTestCase(unittest.TestCase):
 
         # Test the edit page
         response = self.client.get('/movie/edit/1')
-        data = response.get_data(as_text=True)
-        self.assertIn('Edit item', data)
-        self.assertIn('Test Movie', data)
-        self.assertIn('2023', data)
+        self.assert_page(response, present=['Edit item', 'Test Movie', '2023'])
 
         # Test the edit operation
         response = self.client.post('/movie/edit/1', data=dict(
             title='Edited Movie',
             year='2023'
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Item updated', data)
-        self.assertIn('Edited Movie', data)
+        self.assert_page(response, present=['Item updated', 'Edited Movie'])
 
         # Test update with empty title
         response = self.client.post('/movie/edit/1', data=dict(
             title='',
             year='2023'
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Item updated', data)
-        self.assertIn('Invalid input.', data)
+        self.assert_page(response, present=['Invalid input.'], absent=['Item updated'])
 
         # Test update with empty year
         response = self.client.post('/movie/edit/1', data=dict(
             title='Edited Again Movie',
             year=''
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Item updated', data)
-        self.assertNotIn('Edited Again Movie', data)
-        self.assertIn('Invalid input.', data)
+        self.assert_page(
+            response,
+            present=['Invalid input.'],
+            absent=['Item updated', 'Edited Again Movie'],
+        )
 
     def test_delete_item(self):
         """
@@ -151,21 +196,17 @@ class WatchlistTestCase(unittest.TestCase):
         self.login()
 
         response = self.client.post('/movie/delete/1', follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Item deleted.', data)
-        self.assertNotIn('Test Movie', data)
+        self.assert_page(response, present=['Item deleted.'], absent=['Test Movie'])
 
     def test_login_protection(self):
         """
         Test whether login_required works properly.
         """
         response = self.client.get('/')
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Logout', data)
-        self.assertNotIn('Settings', data)
-        self.assertNotIn('<form method="post">', data)
-        self.assertNotIn('Delete', data)
-        self.assertNotIn('Edit', data)
+        self.assert_page(
+            response,
+            absent=['Logout', 'Settings', '<form method="post">', 'Delete', 'Edit'],
+        )
 
     def test_login(self):
         """
@@ -176,49 +217,25 @@ class WatchlistTestCase(unittest.TestCase):
             username='test',
             password='123'
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Login success.', data)
-        self.assertIn('Logout', data)
-        self.assertIn('Settings', data)
-        self.assertIn('Delete', data)
-        self.assertIn('Edit', data)
-        self.assertIn('<form method="post">', data)
-
-        # Login with wrong password.
-        response = self.client.post('/login', data=dict(
-            username='test',
-            password='456'
-        ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Login success.', data)
-        self.assertIn('Invalid username or password.', data)
-
-        # Login with wrong username.
-        response = self.client.post('/login', data=dict(
-            username='wrong',
-            password='123'
-        ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Login success.', data)
-        self.assertIn('Invalid username or password.', data)
-
-        # Login with empty password.
-        response = self.client.post('/login', data=dict(
-            username='test',
-            password=''
-        ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Login success.', data)
-        self.assertIn('Invalid input.', data)
+        self.assert_page(
+            response,
+            present=['Login success.', 'Logout', 'Settings', 'Delete', 'Edit', '<form method="post">'],
+        )
 
-        # Login with empty username.
-        response = self.client.post('/login', data=dict(
-            username='',
-            password='123'
-        ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Login success.', data)
-        self.assertIn('Invalid input.', data)
+        # Login with wrong password, wrong username, empty password and empty username.
+        cases = [
+            ('test', '456', 'Invalid username or password.'),
+            ('wrong', '123', 'Invalid username or password.'),
+            ('test', '', 'Invalid input.'),
+            ('', '123', 'Invalid input.'),
+        ]
+        for username, password, message in cases:
+            with self.subTest(username=username, password=password):
+                response = self.client.post('/login', data=dict(
+                    username=username,
+                    password=password
+                ), follow_redirects=True)
+                self.assert_page(response, present=[message], absent=['Login success.'])
 
     def test_logout(self):
         """
@@ -227,13 +244,11 @@ class WatchlistTestCase(unittest.TestCase):
         self.login()
 
         response = self.client.get('/logout', follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Goodbye.', data)
-        self.assertNotIn('Logout', data)
-        self.assertNotIn('Settings', data)
-        self.assertNotIn('Delete', data)
-        self.assertNotIn('Edit', data)
-        self.assertNotIn('<form method="post">', data)
+        self.assert_page(
+            response,
+            present=['Goodbye.'],
+            absent=['Logout', 'Settings', 'Delete', 'Edit', '<form method="post">'],
+        )
 
     def test_settings(self):
         """
@@ -243,25 +258,19 @@ class WatchlistTestCase(unittest.TestCase):
 
         # Test setting page.
         response = self.client.get('/settings')
-        data = response.get_data(as_text=True)
-        self.assertIn('Settings', data)
-        self.assertIn('Your Name', data)
+        self.assert_page(response, present=['Settings', 'Your Name'])
 
         # Test updating user's name.
         response = self.client.post('/settings', data=dict(
             name='Parzivaal',
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertIn('Settings updated.', data)
-        self.assertIn('Parzivaal', data)
+        self.assert_page(response, present=['Settings updated.', 'Parzivaal'])
 
         # Test updating with empty word.
         response = self.client.post('/settings', data=dict(
             name='',
         ), follow_redirects=True)
-        data = response.get_data(as_text=True)
-        self.assertNotIn('Settings updated.', data)
-        self.assertIn('Invalid input.', data)
+        self.assert_page(response, present=['Invalid input.'], absent=['Settings updated.'])
 
     def test_forge_command(self):
         """
@@ -1,20 +1,14 @@
 import os
-import sys
+from pathlib import Path
 
-from flask import Flask
+from flask import Flask, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 
-WIN = sys.platform.startswith('win')
-if WIN:
-    prefix = 'sqlite:///'
-else:
-    prefix = 'sqlite:////'
-
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev')
-app.config['SQLALCHEMY_DATABASE_URI'] = prefix + os.path.join(os.path.dirname(app.root_path),
-                                                              os.getenv('DATABASE_FILE', 'data.db'))
+database_path = Path(app.root_path).parent / os.getenv('DATABASE_FILE', 'data.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path.as_posix()}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db = SQLAlchemy(app)
@@ -25,14 +19,16 @@ login_manager.login_view = 'login'
 @login_manager.user_loader
 def load_user(user_id):
     from watchlist.modules import User
-    user = User.query.get(int(user_id))
+    user = db.session.get(User, int(user_id))
     return user
 
 
 @app.context_processor
 def inject_user():
     from watchlist.modules import User
-    user = User.query.first()
-    return dict(user=user)
+    # The owner is the same for every template rendered in a request
+    if 'user' not in g:
+        g.user = User.query.first()
+    return dict(user=g.user)
 
 from watchlist import commands, errors, views